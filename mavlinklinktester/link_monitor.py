@@ -22,9 +22,12 @@ Uses asyncio for concurrent operations with MAVConnection classes.
 
 import asyncio
 import csv
+import itertools
 import logging
+import math
 import os
 import time
+from collections import OrderedDict, deque
 from datetime import datetime
 from typing import Optional, Union
 
@@ -55,6 +58,12 @@ class LinkMonitor:
         self.signing_key = signing_key
         self.signing_link_id = signing_link_id
 
+        # Monotonic clocks for all durations (outages, elapsed time) and TIMESYNC
+        # timestamps (integer nanoseconds); swappable in tests.
+        # Wall-clock time is only used for the timestamps in output filenames.
+        self._clock = time.monotonic
+        self._clock_ns = time.monotonic_ns
+
         # MAVConnection instance
         self.connection: Optional[Union[UDPConnection, TCPConnection, SerialConnection]] = None
         self.connection_type = None  # 'udpout', 'udpin', 'tcp', 'tcpin', or 'serial'
@@ -82,11 +91,13 @@ class LinkMonitor:
 
         # Sequence tracking
         self.last_sequence = None
-        self.pending_sequences = {}  # {seq: packet_count} - sequences we're waiting for
+        # {seq: packet_count} - sequences we're waiting for, oldest first
+        self.pending_sequences: OrderedDict = OrderedDict()
         self.packet_count = 0  # Total packet count for tracking pending sequence age
 
         # TIMESYNC tracking for latency measurement
-        self.sent_timestamps = []
+        # Only the last 10 sent timestamps are kept, older ones are dropped on append
+        self.sent_timestamps: deque = deque(maxlen=10)
 
         # Packet tracking for outage detection
         self.last_packet_time = None
@@ -101,12 +112,13 @@ class LinkMonitor:
         self.csv_filepath = None
         self.csv_file = None
         self.csv_writer = None
-        self.start_time = time.time()
+        self.start_time = self._clock()
 
         # Async tasks
         self.tasks = []
 
-    def _sanitize_connection_string(self, conn_str):
+    @staticmethod
+    def _sanitize_connection_string(conn_str):
         """Sanitize connection string for use in filenames."""
         sanitized = conn_str.replace(':', '_').replace('.', '_').replace('/', '_')
         return sanitized
@@ -359,7 +371,7 @@ class LinkMonitor:
             return False
 
         # Set up CSV output
-        self.start_time = time.time()
+        self.start_time = self._clock()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
         # Ensure output directory exists
@@ -401,11 +413,12 @@ class LinkMonitor:
             self.current_bad_order_packets += 1
             return  # Don't update last_sequence for out-of-order packets
 
-        # Clean up old pending sequences (more than 50 packets old) - count them as truly dropped
-        for pending_seq, pending_count in list(self.pending_sequences.items()):
-            if self.packet_count - pending_count > 50:
-                self.current_dropped_packets += 1
-                del self.pending_sequences[pending_seq]
+        # Clean up old pending sequences (more than 50 packets old) - count them as truly dropped.
+        # Entries are kept oldest first, so stop at the first one that is still recent.
+        pending = self.pending_sequences
+        while pending and self.packet_count - next(iter(pending.values())) > 50:
+            pending.popitem(last=False)
+            self.current_dropped_packets += 1
 
         if self.last_sequence is not None:
             expected_seq = (self.last_sequence + 1) % 256
@@ -422,26 +435,29 @@ class LinkMonitor:
                 # Gap detected - add missing sequences to pending list
                 if seq > expected_seq:
                     # Forward gap
-                    missing_count = seq - expected_seq
-                    for i in range(missing_count):
-                        missing_seq = (expected_seq + i) % 256
-                        self.pending_sequences[missing_seq] = self.packet_count
+                    self._add_pending_sequences(range(expected_seq, seq))
                 else:
                     # Wrap-around gap (255 -> 0)
-                    missing_count = (256 - self.last_sequence - 1) + seq
-                    for i in range(missing_count):
-                        missing_seq = (expected_seq + i) % 256
-                        self.pending_sequences[missing_seq] = self.packet_count
+                    self._add_pending_sequences(range(expected_seq, 256))
+                    self._add_pending_sequences(range(0, seq))
 
         self.last_sequence = seq
 
+    def _add_pending_sequences(self, seqs):
+        """Mark a range of missing sequence numbers as pending at the current packet count."""
+        pending = self.pending_sequences
+        already_pending = pending.keys() & seqs
+        pending.update(zip(seqs, itertools.repeat(self.packet_count)))
+        # Re-added sequences move to the back to keep the dict oldest first
+        for seq in already_pending:
+            pending.move_to_end(seq)
+
     def _handle_timesync_response(self, msg):
         """Handle incoming TIMESYNC messages and calculate latency."""
         # Check if this is a response to our request (ts1 should match one we sent)
         if msg.ts1 in self.sent_timestamps:
             # Calculate round-trip time
-            now_ns = time.time() * 1e9
-            rtt_ms = (now_ns - msg.ts1) * 1e-6  # Convert to milliseconds
+            rtt_ms = (self._clock_ns() - msg.ts1) * 1e-6  # Convert to milliseconds
 
             self.current_latency_ms = rtt_ms
             self.histogram.add_latency_sample(rtt_ms)
@@ -452,7 +468,7 @@ class LinkMonitor:
 
     def _update_packet_time(self):
         """Update last packet time for outage detection (called on any received packet)."""
-        current_time = time.time()
+        current_time = self._clock()
         self.last_packet_time = current_time
 
         if self.in_outage:
@@ -473,13 +489,14 @@ class LinkMonitor:
         if self.last_packet_time is None:
             return
 
-        time_since_packet = time.time() - self.last_packet_time
+        now = self._clock()
+        time_since_packet = now - self.last_packet_time
 
         if time_since_packet > self.outage_timeout:
             if not self.in_outage:
                 # Enter outage state
                 self.in_outage = True
-                self.outage_start_time = time.time()
+                self.outage_start_time = now
                 self.consecutive_packets = 0
             # Always set current_outage while in timeout
             self.current_outage = True
@@ -501,7 +518,7 @@ class LinkMonitor:
         if self.in_outage:
             # Exit outage state - record the outage event
             if self.outage_start_time:
-                outage_duration = time.time() - self.outage_start_time
+                outage_duration = self._clock() - self.outage_start_time
                 self.total_outage_seconds = self.total_outage_seconds + outage_duration
 
         # Cancel all tasks
@@ -524,7 +541,7 @@ class LinkMonitor:
 
         # Set the actual elapsed time in the histogram
         if self.start_time:
-            actual_elapsed = time.time() - self.start_time
+            actual_elapsed = self._clock() - self.start_time
             self.histogram.total_seconds = int(round(actual_elapsed))
 
         histogram_path = self.histogram.generate_histogram()
@@ -543,17 +560,11 @@ class LinkMonitor:
             logging.info('  Dropped Packets: %s', self.total_dropped_packets)
             logging.info('  Bad Ordered Packets: %s', self.total_bad_order_packets)
 
-        if self.latency_samples:
-            # don't include measurements of -1 (no measurement)
-            filtered_samples = [lat for lat in self.latency_samples if lat >= 0]
-            if filtered_samples:
-                mean_latency = sum(filtered_samples) / len(filtered_samples)
-                logging.info('  Mean Latency (RTT): %.2fms', mean_latency)
-                median_latency = sorted(filtered_samples)[len(filtered_samples) // 2]
-                logging.info('  Median Latency (RTT): %.2fms', median_latency)
-            else:
-                logging.info('  Mean Latency (RTT): N/A')
-                logging.info('  Median Latency (RTT): N/A')
+        latency_stats = self._latency_stats()
+        if latency_stats is not None:
+            mean_latency, median_latency = latency_stats
+            logging.info('  Mean Latency (RTT): %.2fms', mean_latency)
+            logging.info('  Median Latency (RTT): %.2fms', median_latency)
         else:
             logging.info('  Mean Latency (RTT): N/A')
             logging.info('  Median Latency (RTT): N/A')
@@ -564,18 +575,25 @@ class LinkMonitor:
                      (total_outage_seconds / self.histogram.total_seconds) * 100)
         return histogram_path
 
+    def _latency_stats(self):
+        """Return (mean, median) RTT in ms over valid latency samples, or None if there are none."""
+        # Don't include measurements of -1 (no measurement); filter and sort in a single pass
+        valid_samples = sorted(lat for lat in self.latency_samples if lat >= 0)
+        if not valid_samples:
+            return None
+        mean_latency = math.fsum(valid_samples) / len(valid_samples)
+        median_latency = valid_samples[len(valid_samples) // 2]
+        return mean_latency, median_latency
+
     async def _timesync_loop(self):
         """Send TIMESYNC messages at 2Hz for latency measurement."""
         while self.running:
             try:
                 # Get current time in nanoseconds
-                now_ns = int(time.time() * 1e9)
+                now_ns = self._clock_ns()
 
-                # Store the sent timestamp for matching responses
+                # Store the sent timestamp for matching responses (bounded to the last 10)
                 self.sent_timestamps.append(now_ns)
-                # Keep only last 10 timestamps to avoid memory growth
-                if len(self.sent_timestamps) > 10:
-                    self.sent_timestamps.pop(0)
 
                 # Send TIMESYNC message (tc1=0, ts1=our timestamp)
                 if self.connection is not None:
@@ -609,11 +627,11 @@ class LinkMonitor:
 
     async def _metrics_loop(self):
         """Write metrics to CSV every second."""
-        next_wake = time.time() + 1.0
+        next_wake = self._clock() + 1.0
         while self.running:
             try:
                 # Sleep until next wake time
-                sleep_time = next_wake - time.time()
+                sleep_time = next_wake - self._clock()
                 if sleep_time > 0:
                     await asyncio.sleep(sleep_time)
                 next_wake += 1.0
@@ -622,7 +640,7 @@ class LinkMonitor:
                 self._check_outage()
 
                 # Calculate elapsed time
-                elapsed = time.time() - self.start_time
+                elapsed = self._clock() - self.start_time
 
                 # Write current metrics
                 if self.csv_writer is not None:
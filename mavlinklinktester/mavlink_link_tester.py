@@ -23,7 +23,6 @@ import argparse
 import asyncio
 import logging
 import signal
-import time
 
 from mavlinklinktester.link_monitor import LinkMonitor
 
@@ -37,15 +36,19 @@ class MAVLinkTester:
         self.running = False
         self.stopping = False
         self.loop = None
+        self.shutdown_event = None  # asyncio.Event, created in start() on the running loop
 
     def _signal_handler(self, _signum):
         """Handle shutdown signals."""
         logging.info('Received shutdown signal, stopping gracefully...')
         self.running = False
+        if self.shutdown_event is not None:
+            self.shutdown_event.set()
 
     async def start(self):
         """Start all link monitors."""
         self.loop = asyncio.get_running_loop()
+        self.shutdown_event = asyncio.Event()
 
         # Set up signal handlers for async
         try:
@@ -126,18 +129,11 @@ class MAVLinkTester:
 
         self.running = True
 
-        # Main loop
-        start_time = time.time()
+        # Main loop - wait for a shutdown signal or for the test duration to expire
         try:
-            while self.running:
-                # Check if duration expired
-                if self.args.duration:
-                    elapsed = time.time() - start_time
-                    if elapsed >= self.args.duration:
-                        logging.info('Test duration (%ss) completed.', self.args.duration)
-                        break
-
-                await asyncio.sleep(1)
+            await asyncio.wait_for(self.shutdown_event.wait(), timeout=self.args.duration or None)
+        except asyncio.TimeoutError:
+            logging.info('Test duration (%ss) completed.', self.args.duration)
         except (asyncio.CancelledError, KeyboardInterrupt):
             logging.info('Cancelled.')
         finally:
@@ -17,18 +17,25 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 Shared pytest fixtures for mavlinklinktester tests.
 """
+import asyncio
 import pytest
-import tempfile
 import os
 from unittest.mock import Mock, MagicMock
 from mavlinklinktester.mavlink.pymavutil import getpymavlinkpackage
 
 
+@pytest.fixture(scope='session')
+def event_loop():
+    """Run all async tests on one event loop instead of creating a new loop per test."""
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
+
+
 @pytest.fixture
-def temp_output_dir():
-    """Create a temporary directory for test output files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+def temp_output_dir(tmp_path):
+    """Per-test directory for output files, under pytest's session-wide temp root."""
+    return str(tmp_path)
 
 
 @pytest.fixture
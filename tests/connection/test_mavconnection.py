@@ -155,7 +155,6 @@ class TestMAVConnection:
         sent_data = connection.send_data.call_args[0][0]
         assert isinstance(sent_data, bytes)
 
-    @pytest.mark.asyncio
     async def test_send_heartbeat(self, connection):
         """Test async send_heartbeat method."""
         connection.send_data = Mock()
@@ -164,7 +163,6 @@ class TestMAVConnection:
 
         assert connection.send_data.called
 
-    @pytest.mark.asyncio
     async def test_configure_stream_rates(self, connection, mavlink_module):
         """Test configuring MAVLink stream rates."""
         connection.send_data = Mock()
@@ -180,7 +178,6 @@ class TestMAVConnection:
         # Should have sent 3 REQUEST_DATA_STREAM messages
         assert connection.send_data.call_count == 3
 
-    @pytest.mark.asyncio
     async def test_configure_stream_rates_skips_zero(self, connection):
         """Test that zero stream rates are skipped."""
         connection.send_data = Mock()
@@ -196,7 +193,6 @@ class TestMAVConnection:
         # Should have sent only 2 messages (skipped POSITION)
         assert connection.send_data.call_count == 2
 
-    @pytest.mark.asyncio
     async def test_wait_for_heartbeat_success(self, connection, mavlink_module):
         """Test successful heartbeat wait."""
         # Mock that heartbeat will be received
@@ -217,7 +213,6 @@ class TestMAVConnection:
         assert result is True
         assert connection.heartbeat_received is True
 
-    @pytest.mark.asyncio
     async def test_wait_for_heartbeat_timeout(self, connection):
         """Test heartbeat wait timeout."""
         connection.send_data = Mock()
@@ -83,7 +83,6 @@ class TestSerialLink:
             elif strconnection == self.sname:
                 self.snum += 1
 
-    @pytest.mark.asyncio
     async def test_link_serial(self):
         """Test passing data over a serial connections"""
 
@@ -102,7 +101,7 @@ class TestSerialLink:
 
         loop = asyncio.get_event_loop()
         await serial_asyncio.create_serial_connection(loop, lambda: server, self.sPort, self.baud)
-        await loop.create_server(lambda: client, self.ip, self.port)
+        listener = await loop.create_server(lambda: client, self.ip, self.port)
 
         # wait for 1.00 sec
         await asyncio.sleep(1.0)
@@ -118,6 +117,7 @@ class TestSerialLink:
 
         client.close()
         server.close()
+        listener.close()
 
         # Assert the packets were sent
         assert self.cnum == 1
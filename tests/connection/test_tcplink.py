@@ -60,7 +60,6 @@ class TestTCPLink:
             elif strconnection == self.sname:
                 self.snum += 1
 
-    @pytest.mark.asyncio
     async def test_link_tcp(self):
         """Test passing data between two tcplink connections"""
         client = TCPConnection(rxcallback=self.newpacketcallback,
@@ -74,7 +73,7 @@ class TestTCPLink:
                                target_system=0, target_component=0)
 
         loop = asyncio.get_event_loop()
-        await loop.create_server(lambda: server, self.ip, self.port)
+        listener = await loop.create_server(lambda: server, self.ip, self.port)
         await loop.create_connection(lambda: client, self.ip, self.port)
 
         # send a mavlink packet each way:
@@ -88,12 +87,12 @@ class TestTCPLink:
 
         client.close()
         server.close()
+        listener.close()
 
         # Assert the packets were sent
         assert self.cnum == 1
         assert self.snum == 1
 
-    @pytest.mark.asyncio
     async def test_link_tcp_server(self):
         """Test passing data when there's only a server present"""
         server = TCPConnection(rxcallback=self.newpacketcallback,
@@ -102,8 +101,9 @@ class TestTCPLink:
                                target_system=0, target_component=0)
 
         loop = asyncio.get_event_loop()
+        listener = None
         try:
-            await loop.create_server(lambda: server, self.ip, self.port)
+            listener = await loop.create_server(lambda: server, self.ip, self.port)
         except OSError:
             pass  # This is the exception we want
 
@@ -116,11 +116,12 @@ class TestTCPLink:
         await asyncio.sleep(0.10)
 
         server.close()
+        if listener is not None:
+            listener.close()
 
         # Assert the packets were not sent
         assert self.snum == 0
 
-    @pytest.mark.asyncio
     async def test_link_tcp_client(self):
         """Test passing data when there's only a client present"""
         client = TCPConnection(rxcallback=self.newpacketcallback,
@@ -149,7 +150,6 @@ class TestTCPLink:
         # Assert the packets were not sent
         assert self.cnum == 0
 
-    @pytest.mark.asyncio
     async def test_link_baddata(self):
         """Test passing corrupted data between two tcplink connections"""
         client = TCPConnection(rxcallback=self.newpacketcallback,
@@ -163,7 +163,7 @@ class TestTCPLink:
                                target_system=0, target_component=0)
 
         loop = asyncio.get_event_loop()
-        await loop.create_server(lambda: server, self.ip, self.port)
+        listener = await loop.create_server(lambda: server, self.ip, self.port)
         await loop.create_connection(lambda: client, self.ip, self.port)
 
         # wait for 0.10 sec
@@ -182,6 +182,7 @@ class TestTCPLink:
 
         client.close()
         server.close()
+        listener.close()
 
         # Assert only the correct packets were sent
         assert self.cnum == 1
@@ -60,7 +60,6 @@ class TestUDPLink:
             elif strconnection == self.sname:
                 self.snum += 1
 
-    @pytest.mark.asyncio
     async def test_link_udp(self):
         """Test passing data between two udp connections"""
         client = UDPConnection(rxcallback=self.newpacketcallback,
@@ -97,7 +96,6 @@ class TestUDPLink:
         assert self.cnum == 1
         assert self.snum == 1
 
-    @pytest.mark.asyncio
     async def test_link_udp_server(self):
         """Test passing data when there's only a server present"""
         server = UDPConnection(rxcallback=self.newpacketcallback,
@@ -122,7 +120,6 @@ class TestUDPLink:
         # Assert the packets were not sent
         assert self.snum == 0
 
-    @pytest.mark.asyncio
     async def test_link_udp_client(self):
         """Test passing data when there's only a client present"""
         client = UDPConnection(rxcallback=self.newpacketcallback,
@@ -150,7 +147,6 @@ class TestUDPLink:
         # Assert the packets were not sent
         assert self.cnum == 0
 
-    @pytest.mark.asyncio
     async def test_link_baddata(self):
         """Test passing corrupted data between two udplink connections"""
         client = UDPConnection(rxcallback=self.newpacketcallback,
@@ -20,23 +20,87 @@ Tests sequence tracking, latency calculation, outage detection, and connection p
 """
 import pytest
 import asyncio
-import time
-from unittest.mock import Mock, patch, AsyncMock, MagicMock
+import logging
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+from mavlinklinktester import link_monitor
 from mavlinklinktester.link_monitor import LinkMonitor
 
+_EMPTY_MSGBUF = bytes(30)
+# Nothing is written here: start() is only called with no heartbeat, so it returns before creating
+# any output, and stop() gets a mocked histogram
+_UNUSED_OUTPUT_DIR = '/tmp/mlt_unused'
+
+
+class FakeMsg:
+    """Lightweight stand-in for a pymavlink message (avoids Mock overhead)."""
+
+    __slots__ = ('seq', 'buf', 'typ', 'src_system', 'src_component', 'ts1')
+
+    def __init__(self, seq, typ, buf, src_system, src_component, ts1=None):
+        self.seq = seq
+        self.typ = typ
+        self.buf = buf
+        self.src_system = src_system
+        self.src_component = src_component
+        self.ts1 = ts1
+
+    def get_seq(self):
+        return self.seq
+
+    def get_msgbuf(self):
+        return self.buf
+
+    def get_type(self):
+        return self.typ
+
+    def get_srcSystem(self):
+        return self.src_system
+
+    def get_srcComponent(self):
+        return self.src_component
+
+
+def make_msg(seq, typ='HEARTBEAT', buf=_EMPTY_MSGBUF, src_system=1, src_component=1, ts1=None):
+    """Create a fake message with the given sequence number."""
+    return FakeMsg(seq, typ, buf, src_system, src_component, ts1)
+
+
+class _FakeMav:
+    """MAVLink parser stand-in that rejects every packet, as pymavlink does on a bad CRC."""
+
+    def parse_buffer(self, data):
+        return []
+
+
+class _FakeConnection:
+    """Lightweight stand-in for a MAVConnection (avoids chained Mock setup)."""
+
+    def __init__(self):
+        self.mod = object()
+        self.mav = _FakeMav()
+        self.target_system = 1
+        self.target_component = 1
+        self.closed = False
+
+    def processPackets(self, data):
+        return self.mav.parse_buffer(data)
+
+    def close(self):
+        self.closed = True
+
 
 class TestLinkMonitor:
     """Test LinkMonitor functionality."""
 
     @pytest.fixture
-    def monitor_config(self, temp_output_dir):
+    def monitor_config(self):
         """Basic monitor configuration."""
         return {
             'link_id': 0,
             'connection_str': 'udpin:0.0.0.0:14550',
             'target_system': 1,
             'target_component': 1,
-            'output_dir': temp_output_dir,
+            'output_dir': _UNUSED_OUTPUT_DIR,
             'outage_timeout': 1.0,
             'recovery_hysteresis': 3,
             'stream_rates': {},
@@ -49,31 +113,30 @@ class TestLinkMonitor:
         """Create a LinkMonitor instance for testing."""
         return LinkMonitor(**monitor_config)
 
+    @pytest.fixture
+    def clock(self, monitor):
+        """Replace the monitor's clock with a manually advanced one."""
+        now = [1_000_000.0]
+        monitor._clock = lambda: now[0]
+        return now
+
+    @pytest.fixture
+    def stop_ready(self, monitor, clock):
+        """Stub out the connection, tasks and histogram so stop() does no real I/O."""
+        monitor.connection = _FakeConnection()
+        monitor.csv_file = None
+        monitor.tasks = []
+        monitor.start_time = clock[0] - 10.0  # Started 10 seconds ago
+        monitor.histogram = Mock(total_seconds=10)
+        monitor.histogram.generate_histogram.return_value = '/tmp/histogram.csv'
+        return monitor
+
     def test_sanitize_connection_string(self, monitor):
         """Test connection string sanitization for filenames."""
         assert monitor.sanitized_connection == 'udpin_0_0_0_0_14550'
 
-        monitor2 = LinkMonitor(
-            link_id=1,
-            connection_str='tcp:192.168.1.100:5760',
-            target_system=1,
-            target_component=1,
-            output_dir='/tmp',
-            outage_timeout=1.0,
-            recovery_hysteresis=3
-        )
-        assert monitor2.sanitized_connection == 'tcp_192_168_1_100_5760'
-
-        monitor3 = LinkMonitor(
-            link_id=2,
-            connection_str='/dev/ttyUSB0:57600',
-            target_system=1,
-            target_component=1,
-            output_dir='/tmp',
-            outage_timeout=1.0,
-            recovery_hysteresis=3
-        )
-        assert monitor3.sanitized_connection == '_dev_ttyUSB0_57600'
+        assert LinkMonitor._sanitize_connection_string('tcp:192.168.1.100:5760') == 'tcp_192_168_1_100_5760'
+        assert LinkMonitor._sanitize_connection_string('/dev/ttyUSB0:57600') == '_dev_ttyUSB0_57600'
 
     def test_initialization(self, monitor, monitor_config):
         """Test LinkMonitor initialization."""
@@ -88,18 +151,13 @@ class TestLinkMonitor:
         assert monitor.current_total_packets == 0
         assert monitor.current_dropped_packets == 0
         assert monitor.last_sequence is None
-        assert len(monitor.pending_sequences) == 0
+        assert not monitor.pending_sequences
 
     def test_sequence_tracking_normal(self, monitor):
         """Test normal sequential packet tracking."""
-        # Create mock messages with sequential sequence numbers
+        # Feed sequential sequence numbers
         for seq in range(5):
-            msg = Mock()
-            msg.get_seq.return_value = seq
-            msg.get_msgbuf.return_value = b'\x00' * 30
-            msg.get_type.return_value = 'HEARTBEAT'
-
-            monitor._track_sequence(msg)
+            monitor._track_sequence(make_msg(seq))
 
         # Last sequence should be 4
         assert monitor.last_sequence == 4
@@ -112,17 +170,10 @@ class TestLinkMonitor:
         """Test sequence tracking with missing packets."""
         # Send sequence 0, 1, 2, then skip to 5
         for seq in [0, 1, 2, 5]:
-            msg = Mock()
-            msg.get_seq.return_value = seq
-            msg.get_msgbuf.return_value = b'\x00' * 30
-            msg.get_type.return_value = 'HEARTBEAT'
-
-            monitor._track_sequence(msg)
+            monitor._track_sequence(make_msg(seq))
 
-        # Should have pending sequences 3 and 4
-        assert 3 in monitor.pending_sequences
-        assert 4 in monitor.pending_sequences
-        assert len(monitor.pending_sequences) == 2
+        # Should have exactly pending sequences 3 and 4
+        assert monitor.pending_sequences.keys() == {3, 4}
 
         # No drops yet (packets are pending)
         assert monitor.current_dropped_packets == 0
@@ -131,71 +182,62 @@ class TestLinkMonitor:
         """Test out-of-order packet detection."""
         # Send 0, 1, 2, skip 3, 4, then receive 3 (out of order)
         for seq in [0, 1, 2, 5]:
-            msg = Mock()
-            msg.get_seq.return_value = seq
-            msg.get_msgbuf.return_value = b'\x00' * 30
-            msg.get_type.return_value = 'HEARTBEAT'
-            monitor._track_sequence(msg)
+            monitor._track_sequence(make_msg(seq))
 
         # Now send the late packet 3
-        msg = Mock()
-        msg.get_seq.return_value = 3
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_type.return_value = 'HEARTBEAT'
-        monitor._track_sequence(msg)
+        monitor._track_sequence(make_msg(3))
 
         # Should be marked as bad order
         assert monitor.current_bad_order_packets == 1
-        # Should be removed from pending
-        assert 3 not in monitor.pending_sequences
-        # Sequence 4 should still be pending
-        assert 4 in monitor.pending_sequences
+        # Should be removed from pending, leaving only sequence 4
+        assert monitor.pending_sequences.keys() == {4}
 
     def test_sequence_tracking_wraparound(self, monitor):
         """Test sequence number wraparound (255 -> 0)."""
         # Start at 254
         for seq in [254, 255, 0, 1, 2]:
-            msg = Mock()
-            msg.get_seq.return_value = seq
-            msg.get_msgbuf.return_value = b'\x00' * 30
-            msg.get_type.return_value = 'HEARTBEAT'
-
-            monitor._track_sequence(msg)
+            monitor._track_sequence(make_msg(seq))
 
         # Should handle wraparound correctly
         assert monitor.last_sequence == 2
-        assert len(monitor.pending_sequences) == 0
+        assert not monitor.pending_sequences
         assert monitor.current_dropped_packets == 0
 
     def test_timesync_latency_calculation(self, monitor):
         """Test TIMESYNC latency measurement."""
-        # Record a sent timestamp
-        sent_time_ns = int(time.time() * 1e9)
+        # Record a sent timestamp at a fixed clock reading
+        sent_time_ns = 1_000_000_000
         monitor.sent_timestamps.append(sent_time_ns)
 
         # Simulate a TIMESYNC response after 50ms
-        time.sleep(0.05)
+        monitor._clock_ns = lambda: sent_time_ns + 50_000_000
 
-        msg = Mock()
-        msg.get_type.return_value = 'TIMESYNC'
-        msg.ts1 = sent_time_ns
-        msg.get_seq.return_value = 10
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_srcSystem.return_value = 1
-        msg.get_srcComponent.return_value = 1
+        msg = make_msg(10, typ='TIMESYNC', ts1=sent_time_ns)
 
         monitor._handle_timesync_response(msg)
 
-        # Latency should be approximately 50ms
-        assert 40 < monitor.current_latency_ms < 70  # Allow some variance
+        # Latency should be the simulated 50ms
+        assert abs(monitor.current_latency_ms - 50.0) < 0.001
         # Timestamp should be removed
         assert sent_time_ns not in monitor.sent_timestamps
 
-    def test_outage_detection_entry(self, monitor):
+    def test_timesync_stale_response_ignored(self, monitor):
+        """Test that only the last 10 sent timestamps are kept and older responses are ignored."""
+        monitor.sent_timestamps.extend(range(11))
+        assert list(monitor.sent_timestamps) == list(range(1, 11))
+
+        # Response to the evicted first request
+        monitor._handle_timesync_response(make_msg(10, typ='TIMESYNC', ts1=0))
+
+        assert monitor.latency_samples == []
+        assert monitor.current_latency_ms == -1.0
+
+    def test_outage_detection_entry(self, monitor, clock):
         """Test entering outage state."""
-        # Set last packet time to 2 seconds ago
-        monitor.last_packet_time = time.time() - 2.0
+        # Last packet arrived two seconds before the check
+        monitor.last_packet_time = clock[0]
         monitor.outage_timeout = 1.0
+        clock[0] += 2.0
 
         # Check for outage
         monitor._check_outage()
@@ -203,39 +245,31 @@ class TestLinkMonitor:
         # Should be in outage
         assert monitor.in_outage is True
         assert monitor.current_outage is True
-        assert monitor.outage_start_time is not None
+        assert monitor.outage_start_time == clock[0]
 
-    def test_outage_detection_recovery(self, monitor):
+    def test_outage_detection_recovery(self, monitor, clock):
         """Test recovery from outage with hysteresis."""
         # Enter outage state
-        monitor.last_packet_time = time.time() - 2.0
+        monitor.last_packet_time = clock[0]
         monitor.outage_timeout = 1.0
+        clock[0] += 2.0
         monitor._check_outage()
         assert monitor.in_outage is True
 
-        # First packet - still in outage
-        monitor._update_packet_time()
-        assert monitor.in_outage is True
-        assert monitor.consecutive_packets == 1
+        # Packets resume half a second into the outage, in a single burst
+        clock[0] += 0.5
+        transitions = []
+        for _ in range(3):
+            monitor._update_packet_time()
+            transitions.append((monitor.consecutive_packets, monitor.in_outage))
 
-        # Second packet - still in outage
-        monitor._update_packet_time()
-        assert monitor.in_outage is True
-        assert monitor.consecutive_packets == 2
-
-        # Third packet - should exit outage
-        monitor._update_packet_time()
-        assert monitor.in_outage is False
-        assert monitor.consecutive_packets >= 3
+        # Still in outage for the first two packets, the third exits it
+        assert transitions == [(1, True), (2, True), (3, False)]
+        assert monitor.total_outage_seconds == 0.5
 
     def test_message_received_callback(self, monitor):
         """Test message received callback updates counters."""
-        msg = Mock()
-        msg.get_type.return_value = 'HEARTBEAT'
-        msg.get_seq.return_value = 0
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_srcSystem.return_value = 1
-        msg.get_srcComponent.return_value = 1
+        msg = make_msg(0)
 
         initial_packets = monitor.current_total_packets
         initial_bytes = monitor.current_bytes
@@ -253,15 +287,8 @@ class TestLinkMonitor:
         parse_buffer() when robust_parsing is enabled. They won't increment
         packet counters and will appear as gaps in the sequence numbers.
         """
-        # Create a mock connection with parse_buffer
-        monitor.connection = Mock()
-        monitor.connection.mod = Mock()
-        monitor.connection.target_system = 1
-        monitor.connection.target_component = 1
-
-        # Mock parse_buffer to return empty list (simulating bad CRC rejection)
-        monitor.connection.mav = Mock()
-        monitor.connection.mav.parse_buffer = Mock(return_value=[])
+        # Fake connection whose parse_buffer returns no messages (simulating bad CRC rejection)
+        monitor.connection = _FakeConnection()
 
         initial_packets = monitor.current_total_packets
         initial_bytes = monitor.current_bytes
@@ -276,47 +303,19 @@ class TestLinkMonitor:
         assert monitor.current_total_packets == initial_packets
         assert monitor.current_bytes == initial_bytes
 
-        # Now send a valid packet (sequence 1) to verify gap detection
-        msg_valid = Mock()
-        msg_valid.get_type.return_value = 'HEARTBEAT'
-        msg_valid.get_seq.return_value = 1
-        msg_valid.get_msgbuf.return_value = b'\x00' * 30
-
-        # First send sequence 0
-        msg0 = Mock()
-        msg0.get_type.return_value = 'HEARTBEAT'
-        msg0.get_seq.return_value = 0
-        msg0.get_msgbuf.return_value = b'\x00' * 30
-        msg0.get_srcSystem.return_value = 1
-        msg0.get_srcComponent.return_value = 1
-        monitor._on_message_received(msg0, 'test')
-
-        # Then skip to sequence 2 (as if sequence 1 had bad CRC)
-        msg2 = Mock()
-        msg2.get_type.return_value = 'HEARTBEAT'
-        msg2.get_seq.return_value = 2
-        msg2.get_msgbuf.return_value = b'\x00' * 30
-        msg2.get_srcSystem.return_value = 1
-        msg2.get_srcComponent.return_value = 1
-        monitor._on_message_received(msg2, 'test')
-
-        # Sequence 1 should be pending (appears as dropped due to bad CRC)
-        assert 1 in monitor.pending_sequences
-        assert len(monitor.pending_sequences) == 1
+        # Now send valid packets to verify gap detection: first sequence 0,
+        # then skip to sequence 2 (as if sequence 1 had bad CRC)
+        monitor._on_message_received(make_msg(0), 'test')
+        monitor._on_message_received(make_msg(2), 'test')
+
+        # Only sequence 1 should be pending (appears as dropped due to bad CRC)
+        assert monitor.pending_sequences.keys() == {1}
 
     def test_filter_wrong_system_id(self, monitor):
         """Test that messages from wrong system ID are filtered out."""
-        # Configure monitor for system 1, component 1
-        monitor.target_system = 1
-        monitor.target_component = 1
-
+        # Monitor is configured for system 1, component 1
         # Create message from system 2, component 1 (wrong system)
-        msg = Mock()
-        msg.get_type.return_value = 'HEARTBEAT'
-        msg.get_seq.return_value = 0
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_srcSystem.return_value = 2  # Wrong system ID
-        msg.get_srcComponent.return_value = 1
+        msg = make_msg(0, src_system=2)
 
         initial_packets = monitor.current_total_packets
         initial_bytes = monitor.current_bytes
@@ -330,17 +329,9 @@ class TestLinkMonitor:
 
     def test_filter_wrong_component_id(self, monitor):
         """Test that messages from wrong component ID are filtered out."""
-        # Configure monitor for system 1, component 1
-        monitor.target_system = 1
-        monitor.target_component = 1
-
+        # Monitor is configured for system 1, component 1
         # Create message from system 1, component 2 (wrong component)
-        msg = Mock()
-        msg.get_type.return_value = 'HEARTBEAT'
-        msg.get_seq.return_value = 0
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_srcSystem.return_value = 1
-        msg.get_srcComponent.return_value = 2  # Wrong component ID
+        msg = make_msg(0, src_component=2)
 
         initial_packets = monitor.current_total_packets
         initial_bytes = monitor.current_bytes
@@ -354,17 +345,9 @@ class TestLinkMonitor:
 
     def test_filter_wrong_system_and_component_id(self, monitor):
         """Test that messages from wrong system and component ID are filtered out."""
-        # Configure monitor for system 1, component 1
-        monitor.target_system = 1
-        monitor.target_component = 1
-
+        # Monitor is configured for system 1, component 1
         # Create message from system 2, component 2 (both wrong)
-        msg = Mock()
-        msg.get_type.return_value = 'HEARTBEAT'
-        msg.get_seq.return_value = 0
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_srcSystem.return_value = 2  # Wrong system ID
-        msg.get_srcComponent.return_value = 2  # Wrong component ID
+        msg = make_msg(0, src_system=2, src_component=2)
 
         initial_packets = monitor.current_total_packets
         initial_bytes = monitor.current_bytes
@@ -378,17 +361,9 @@ class TestLinkMonitor:
 
     def test_accept_correct_system_and_component_id(self, monitor):
         """Test that messages with correct system and component ID are accepted."""
-        # Configure monitor for system 1, component 1
-        monitor.target_system = 1
-        monitor.target_component = 1
-
+        # Monitor is configured for system 1, component 1
         # Create message from system 1, component 1 (correct)
-        msg = Mock()
-        msg.get_type.return_value = 'HEARTBEAT'
-        msg.get_seq.return_value = 0
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_srcSystem.return_value = 1  # Correct system ID
-        msg.get_srcComponent.return_value = 1  # Correct component ID
+        msg = make_msg(0)
 
         initial_packets = monitor.current_total_packets
         initial_bytes = monitor.current_bytes
@@ -403,12 +378,7 @@ class TestLinkMonitor:
     def test_filter_bad_data_message(self, monitor):
         """Test that BAD_DATA messages are filtered out."""
         # Create BAD_DATA message with correct system/component
-        msg = Mock()
-        msg.get_type.return_value = 'BAD_DATA'
-        msg.get_seq.return_value = 0
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_srcSystem.return_value = 1
-        msg.get_srcComponent.return_value = 1
+        msg = make_msg(0, typ='BAD_DATA')
 
         initial_packets = monitor.current_total_packets
         initial_bytes = monitor.current_bytes
@@ -423,47 +393,24 @@ class TestLinkMonitor:
     def test_filter_bad_data_in_sequence(self, monitor):
         """Test that BAD_DATA messages don't affect sequence tracking."""
         # Send sequence 0, 1 normally
-        for seq in [0, 1]:
-            msg = Mock()
-            msg.get_seq.return_value = seq
-            msg.get_msgbuf.return_value = b'\x00' * 30
-            msg.get_type.return_value = 'HEARTBEAT'
-            msg.get_srcSystem.return_value = 1
-            msg.get_srcComponent.return_value = 1
-            monitor._on_message_received(msg, 'test')
+        for seq in range(2):
+            monitor._on_message_received(make_msg(seq), 'test')
 
         # Send BAD_DATA with sequence 2 (should be ignored)
-        bad_msg = Mock()
-        bad_msg.get_seq.return_value = 2
-        bad_msg.get_msgbuf.return_value = b'\x00' * 30
-        bad_msg.get_type.return_value = 'BAD_DATA'
-        bad_msg.get_srcSystem.return_value = 1
-        bad_msg.get_srcComponent.return_value = 1
-        monitor._on_message_received(bad_msg, 'test')
+        monitor._on_message_received(make_msg(2, typ='BAD_DATA'), 'test')
 
         # Send sequence 3 normally
-        msg = Mock()
-        msg.get_seq.return_value = 3
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_type.return_value = 'HEARTBEAT'
-        msg.get_srcSystem.return_value = 1
-        msg.get_srcComponent.return_value = 1
-        monitor._on_message_received(msg, 'test')
-
-        # Last sequence should be 3, and sequence 2 should be pending (gap)
+        monitor._on_message_received(make_msg(3), 'test')
+
+        # Last sequence should be 3, and only sequence 2 should be pending (gap)
         assert monitor.last_sequence == 3
-        assert 2 in monitor.pending_sequences
+        assert monitor.pending_sequences.keys() == {2}
         assert monitor.current_total_packets == 3  # Only non-BAD_DATA counted
 
     def test_filter_both_bad_data_and_wrong_sysid(self, monitor):
         """Test that messages with both BAD_DATA and wrong system ID are filtered."""
         # Create BAD_DATA message with wrong system ID
-        msg = Mock()
-        msg.get_type.return_value = 'BAD_DATA'
-        msg.get_seq.return_value = 0
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_srcSystem.return_value = 2  # Wrong system
-        msg.get_srcComponent.return_value = 1
+        msg = make_msg(0, typ='BAD_DATA', src_system=2)
 
         initial_packets = monitor.current_total_packets
 
@@ -472,86 +419,46 @@ class TestLinkMonitor:
         # Should be filtered out by system ID check (happens first)
         assert monitor.current_total_packets == initial_packets
 
-    @pytest.mark.asyncio
-    async def test_connection_string_parsing_udpin(self, monitor_config, temp_output_dir):
-        """Test parsing of udpin connection string."""
-        monitor = LinkMonitor(
-            link_id=0,
-            connection_str='udpin:0.0.0.0:14550',
-            target_system=1,
-            target_component=1,
-            output_dir=temp_output_dir,
-            outage_timeout=1.0,
-            recovery_hysteresis=3
-        )
-
-        # Test connection string parsing
-        conn_str = monitor.connection_str
-        assert conn_str.startswith('udpin:')
-        parts = conn_str.split(':')
-        assert len(parts) == 3
-        assert parts[1] == '0.0.0.0'
-        assert parts[2] == '14550'
-
-    @pytest.mark.asyncio
-    async def test_connection_string_parsing_udpout(self, temp_output_dir):
-        """Test parsing of udpout connection string."""
-        monitor = LinkMonitor(
-            link_id=0,
-            connection_str='udpout:192.168.1.100:14550',
-            target_system=1,
-            target_component=1,
-            output_dir=temp_output_dir,
-            outage_timeout=1.0,
-            recovery_hysteresis=3
-        )
-
-        conn_str = monitor.connection_str
-        assert conn_str.startswith('udpout:')
-        parts = conn_str.split(':')
-        assert len(parts) == 3
-        assert parts[1] == '192.168.1.100'
-        assert parts[2] == '14550'
-
-    @pytest.mark.asyncio
-    async def test_connection_string_parsing_tcp(self, temp_output_dir):
-        """Test parsing of tcp connection string."""
-        monitor = LinkMonitor(
-            link_id=0,
-            connection_str='tcp:192.168.1.100:5760',
-            target_system=1,
-            target_component=1,
-            output_dir=temp_output_dir,
-            outage_timeout=1.0,
-            recovery_hysteresis=3
-        )
-
-        conn_str = monitor.connection_str
-        assert conn_str.startswith('tcp:')
-        parts = conn_str.split(':')
-        assert len(parts) == 3
-        assert parts[1] == '192.168.1.100'
-        assert parts[2] == '5760'
-
-    @pytest.mark.asyncio
-    async def test_connection_string_parsing_serial(self, temp_output_dir):
-        """Test parsing of serial connection string."""
-        monitor = LinkMonitor(
-            link_id=0,
-            connection_str='/dev/ttyUSB0:57600',
-            target_system=1,
-            target_component=1,
-            output_dir=temp_output_dir,
-            outage_timeout=1.0,
-            recovery_hysteresis=3
-        )
-
-        conn_str = monitor.connection_str
-        assert conn_str.startswith('/dev/')
-        parts = conn_str.split(':')
-        assert len(parts) == 2
-        assert parts[0] == '/dev/ttyUSB0'
-        assert parts[1] == '57600'
+    @pytest.mark.parametrize('connection_str,conn_class,connection_type,opener,expected_args,expected_kwargs', [
+        ('udpin:0.0.0.0:14550', 'UDPConnection', 'udpin', 'create_datagram_endpoint',
+         [], {'local_addr': ('0.0.0.0', 14550)}),
+        ('udpout:192.168.1.100:14550', 'UDPConnection', 'udpout', 'create_datagram_endpoint',
+         [], {'remote_addr': ('192.168.1.100', 14550)}),
+        ('tcp:192.168.1.100:5760', 'TCPConnection', 'tcp', 'create_connection',
+         ['192.168.1.100', 5760], {}),
+        ('tcpin:0.0.0.0:5760', 'TCPConnection', 'tcpin', 'create_server',
+         ['0.0.0.0', 5760], {}),
+        ('/dev/ttyUSB0:57600', 'SerialConnection', 'serial', None,
+         ['/dev/ttyUSB0'], {'baudrate': 57600}),
+    ])
+    async def test_connection_string_parsing(self, monitor, connection_str, conn_class, connection_type,
+                                             opener, expected_args, expected_kwargs):
+        """Test that start() parses udpin, udpout, tcp, tcpin and serial connection strings."""
+        monitor.connection_str = connection_str
+
+        # No heartbeat arrives, so start() returns right after opening the connection
+        connection = Mock()
+        connection.wait_for_heartbeat = AsyncMock(return_value=False)
+
+        if opener is None:
+            opener_patch = patch.object(link_monitor.serial_asyncio, 'create_serial_connection', AsyncMock())
+        else:
+            opener_patch = patch.object(asyncio.get_running_loop(), opener, AsyncMock())
+
+        with patch.object(link_monitor, conn_class, Mock(return_value=connection)) as mock_class, \
+                opener_patch as mock_opener:
+            assert await monitor.start() is False
+
+        assert monitor.connection_type == connection_type
+        assert monitor.connection is connection
+        assert mock_class.call_args.kwargs['name'] == connection_str
+
+        # The protocol factory hands over the connection; host/port (or device) follow it
+        call_args = mock_opener.call_args
+        factory = next(arg for arg in call_args.args if callable(arg))
+        assert factory() is connection
+        assert list(call_args.args[call_args.args.index(factory) + 1:]) == expected_args
+        assert call_args.kwargs == expected_kwargs
 
     def test_pending_sequence_timeout(self, monitor):
         """Test that old pending sequences (>50 packets old) are marked as dropped."""
@@ -565,34 +472,41 @@ class TestLinkMonitor:
         monitor.pending_sequences[11] = 80  # packet_count - 80 = 20 packets old
 
         # Process a new message (increments packet_count to 101)
-        msg = Mock()
-        msg.get_seq.return_value = 12
-        msg.get_msgbuf.return_value = b'\x00' * 30
-        msg.get_type.return_value = 'HEARTBEAT'
-
-        monitor._track_sequence(msg)
+        monitor._track_sequence(make_msg(12))
 
         # Old sequence (>50 packets) should be dropped
-        assert 10 not in monitor.pending_sequences
         assert monitor.current_dropped_packets == 1
 
-        # Recent sequence (<50 packets) should still be pending
-        assert 11 in monitor.pending_sequences
+        # Only the recent sequence (<50 packets) should still be pending
+        assert monitor.pending_sequences.keys() == {11}
+
+    def test_pending_sequences_kept_oldest_first(self, monitor):
+        """Test that pending sequences stay ordered by age, so the timeout sweep can stop early."""
+        # 0, 1, 2, 5 leaves 3 and 4 pending, 200 adds 6-199, then 5 wraps around
+        # (200 -> 5) and re-adds 201-255 and 0-4, including the still-pending 3 and 4
+        for seq in [0, 1, 2, 5, 200, 5]:
+            monitor._track_sequence(make_msg(seq))
+
+        ages = list(monitor.pending_sequences.values())
+        assert ages == sorted(ages)
+        # The re-added sequences were moved to the back
+        assert sorted(list(monitor.pending_sequences)[-5:]) == [0, 1, 2, 3, 4]
 
-    def test_outage_duration_accumulation(self, monitor):
+    def test_outage_duration_accumulation(self, monitor, clock):
         """Test that total outage duration is accumulated correctly."""
-        # Simulate an outage of 2 seconds
-        monitor.outage_start_time = time.time() - 2.0
-        monitor.in_outage = True
+        # Simulate two outages of 0.25 and 0.5 seconds, each ended by a burst of packets
+        for duration in (0.25, 0.5):
+            monitor.outage_start_time = clock[0]
+            monitor.in_outage = True
+            clock[0] += duration
 
-        # Recover from outage
-        monitor._update_packet_time()  # This should trigger recovery
-        monitor.in_outage = False
-        outage_duration = time.time() - monitor.outage_start_time
-        monitor.total_outage_seconds += outage_duration
+            # Recover from outage
+            for _ in range(monitor.recovery_hysteresis):
+                monitor._update_packet_time()
+            assert monitor.in_outage is False
 
         # Check total outage seconds
-        assert 1.9 < monitor.total_outage_seconds < 2.1  # Allow some variance
+        assert monitor.total_outage_seconds == 0.75
 
     def test_no_outage_duration_when_no_outage(self, monitor):
         """Test that total outage duration remains zero when no outage occurs."""
@@ -606,11 +520,11 @@ class TestLinkMonitor:
         # Check total outage seconds
         assert monitor.total_outage_seconds == 0.0
 
-    @pytest.mark.asyncio
-    async def test_outage_counted_when_program_closed_during_outage(self, monitor):
+    @pytest.mark.usefixtures('stop_ready')
+    async def test_outage_counted_when_program_closed_during_outage(self, monitor, clock):
         """Test that outage duration is counted when stop() is called during an active outage."""
         # Simulate entering an outage state
-        outage_start = time.time() - 3.0  # Outage started 3 seconds ago
+        outage_start = clock[0] - 0.25  # Outage started 0.25 seconds ago
         monitor.in_outage = True
         monitor.outage_start_time = outage_start
         monitor.total_outage_seconds = 0.0
@@ -619,34 +533,19 @@ class TestLinkMonitor:
         assert monitor.in_outage is True
         assert monitor.outage_start_time is not None
 
-        # Call stop() while in outage
-        # Mock the connection and tasks to avoid actual cleanup
-        monitor.connection = Mock()
-        monitor.connection.close = Mock()
-        monitor.csv_file = None
-        monitor.tasks = []
-        monitor.start_time = time.time() - 10.0  # Started 10 seconds ago
-
-        # Mock the histogram generation
-        monitor.histogram = Mock()
-        monitor.histogram.total_seconds = 10
-        monitor.histogram.generate_histogram = Mock(return_value='/tmp/histogram.csv')
-
         await monitor.stop()
 
         # Verify that the outage duration was counted
-        # Should be approximately 3 seconds (with some tolerance for execution time)
-        assert monitor.total_outage_seconds >= 2.9
-        assert monitor.total_outage_seconds <= 3.1
+        assert monitor.total_outage_seconds == 0.25
 
-    @pytest.mark.asyncio
-    async def test_multiple_outages_counted_when_closed_during_final_outage(self, monitor):
+    @pytest.mark.usefixtures('stop_ready')
+    async def test_multiple_outages_counted_when_closed_during_final_outage(self, monitor, clock):
         """Test that multiple outages are properly accumulated when stop() is called during an outage."""
         # Simulate first outage that was already resolved
         monitor.total_outage_seconds = 5.0  # 5 seconds from previous outages
 
         # Simulate entering a new outage state
-        outage_start = time.time() - 2.0  # Current outage started 2 seconds ago
+        outage_start = clock[0] - 0.25  # Current outage started 0.25 seconds ago
         monitor.in_outage = True
         monitor.outage_start_time = outage_start
 
@@ -654,27 +553,16 @@ class TestLinkMonitor:
         assert monitor.in_outage is True
         assert monitor.outage_start_time is not None
 
-        # Call stop() while in second outage
-        # Mock the connection and tasks to avoid actual cleanup
-        monitor.connection = Mock()
-        monitor.connection.close = Mock()
-        monitor.csv_file = None
-        monitor.tasks = []
-        monitor.start_time = time.time() - 20.0  # Started 20 seconds ago
-
-        # Mock the histogram generation
-        monitor.histogram = Mock()
-        monitor.histogram.total_seconds = 20
-        monitor.histogram.generate_histogram = Mock(return_value='/tmp/histogram.csv')
+        # This run started 20 seconds ago
+        monitor.start_time = clock[0] - 20.0
 
         await monitor.stop()
 
-        # Verify that both outages are counted
-        # Should be approximately 7 seconds total (5 + 2)
-        assert monitor.total_outage_seconds >= 6.9
-        assert monitor.total_outage_seconds <= 7.1
+        # Verify that both outages are counted (5 + 0.25)
+        assert monitor.total_outage_seconds == 5.25
+        assert monitor.histogram.total_seconds == 20
 
-    @pytest.mark.asyncio
+    @pytest.mark.usefixtures('stop_ready')
     async def test_no_additional_outage_counted_when_closed_not_in_outage(self, monitor):
         """Test that no extra outage time is added when stop() is called while not in outage."""
         # Simulate previous outages that were resolved
@@ -682,116 +570,28 @@ class TestLinkMonitor:
         monitor.in_outage = False
         monitor.outage_start_time = None
 
-        # Call stop() while NOT in outage
-        # Mock the connection and tasks to avoid actual cleanup
-        monitor.connection = Mock()
-        monitor.connection.close = Mock()
-        monitor.csv_file = None
-        monitor.tasks = []
-        monitor.start_time = time.time() - 10.0
-
-        # Mock the histogram generation
-        monitor.histogram = Mock()
-        monitor.histogram.total_seconds = 10
-        monitor.histogram.generate_histogram = Mock(return_value='/tmp/histogram.csv')
-
         await monitor.stop()
 
         # Verify that no additional outage time was added
         assert monitor.total_outage_seconds == 3.0
+        assert monitor.connection.closed is True
+
+    @pytest.mark.usefixtures('stop_ready')
+    @pytest.mark.parametrize('samples,expected_mean', [
+        ([10.0, -1.0, 20.0, -1.0, 30.0, 15.0, -1.0], 18.75),  # Only valid samples averaged
+        ([-1.0, -1.0, -1.0], None),  # All samples are -1
+        ([], None),  # No samples
+    ], ids=['negative_one_excluded', 'all_negative_one', 'empty'])
+    async def test_latency_stats(self, monitor, caplog, samples, expected_mean):
+        """Test that -1 latency samples are excluded from statistics and N/A is reported without valid samples."""
+        caplog.set_level(logging.INFO)
+        monitor.latency_samples = samples
 
-    @pytest.mark.asyncio
-    async def test_latency_negative_one_excluded_from_stats(self, monitor):
-        """Test that latency measurements of -1 are excluded from statistics calculations."""
-        # Add a mix of valid latency samples and -1 values
-        monitor.latency_samples = [10.0, -1.0, 20.0, -1.0, 30.0, 15.0, -1.0]
-
-        # Mock the connection and tasks to avoid actual cleanup
-        monitor.connection = Mock()
-        monitor.connection.close = Mock()
-        monitor.csv_file = None
-        monitor.tasks = []
-        monitor.start_time = time.time() - 10.0
-
-        # Mock the histogram generation
-        monitor.histogram = Mock()
-        monitor.histogram.total_seconds = 10
-        monitor.histogram.generate_histogram = Mock(return_value='/tmp/histogram.csv')
-
-        # Capture log output to verify stats calculation
-        with patch('mavlinklinktester.link_monitor.logging') as mock_logging:
-            await monitor.stop()
-
-            # Find the mean latency log call
-            mean_latency_logged = False
-            expected_mean = (10.0 + 20.0 + 30.0 + 15.0) / 4  # Only valid samples: 18.75
-
-            for call in mock_logging.info.call_args_list:
-                if len(call[0]) > 0 and 'Mean Latency (RTT)' in str(call[0][0]):
-                    # Check that the value is close to expected (18.75ms)
-                    if len(call[0]) > 1:
-                        actual_mean = call[0][1]
-                        assert abs(actual_mean - expected_mean) < 0.01
-                        mean_latency_logged = True
-
-            assert mean_latency_logged, 'Mean latency should be logged'
-
-    @pytest.mark.asyncio
-    async def test_latency_all_negative_one_reports_na(self, monitor):
-        """Test that when all latency samples are -1, N/A is reported."""
-        # Add only -1 samples
-        monitor.latency_samples = [-1.0, -1.0, -1.0]
-
-        # Mock the connection and tasks to avoid actual cleanup
-        monitor.connection = Mock()
-        monitor.connection.close = Mock()
-        monitor.csv_file = None
-        monitor.tasks = []
-        monitor.start_time = time.time() - 10.0
-
-        # Mock the histogram generation
-        monitor.histogram = Mock()
-        monitor.histogram.total_seconds = 10
-        monitor.histogram.generate_histogram = Mock(return_value='/tmp/histogram.csv')
-
-        # Capture log output to verify N/A is reported
-        with patch('mavlinklinktester.link_monitor.logging') as mock_logging:
-            await monitor.stop()
-
-            # Find the mean latency log call
-            na_logged = False
-            for call in mock_logging.info.call_args_list:
-                if len(call[0]) > 0 and 'Mean Latency (RTT): N/A' in str(call[0]):
-                    na_logged = True
-
-            assert na_logged, 'N/A should be logged when all samples are -1'
-
-    @pytest.mark.asyncio
-    async def test_latency_empty_list_reports_na(self, monitor):
-        """Test that when no latency samples exist, N/A is reported."""
-        # Empty latency samples list
-        monitor.latency_samples = []
-
-        # Mock the connection and tasks to avoid actual cleanup
-        monitor.connection = Mock()
-        monitor.connection.close = Mock()
-        monitor.csv_file = None
-        monitor.tasks = []
-        monitor.start_time = time.time() - 10.0
-
-        # Mock the histogram generation
-        monitor.histogram = Mock()
-        monitor.histogram.total_seconds = 10
-        monitor.histogram.generate_histogram = Mock(return_value='/tmp/histogram.csv')
-
-        # Capture log output to verify N/A is reported
-        with patch('mavlinklinktester.link_monitor.logging') as mock_logging:
-            await monitor.stop()
-
-            # Find the mean latency log call
-            na_logged = False
-            for call in mock_logging.info.call_args_list:
-                if len(call[0]) > 0 and 'Mean Latency (RTT): N/A' in str(call[0]):
-                    na_logged = True
+        await monitor.stop()
 
-            assert na_logged, 'N/A should be logged when no samples exist'
+        # Mean latency should be logged exactly once
+        mean_messages = [message for message in caplog.messages if message.startswith('  Mean Latency (RTT)')]
+        if expected_mean is None:
+            assert mean_messages == ['  Mean Latency (RTT): N/A']
+        else:
+            assert mean_messages == [f'  Mean Latency (RTT): {expected_mean:.2f}ms']
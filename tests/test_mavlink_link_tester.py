@@ -20,42 +20,102 @@ Tests multi-monitor management, signal handling, and overall orchestration.
 """
 import pytest
 import asyncio
+import os
+import signal
+import sys
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
+from mavlinklinktester import mavlink_link_tester
 from mavlinklinktester.mavlink_link_tester import MAVLinkTester
 import argparse
 
 
+# Command line defaults shared by every test's argument namespace
+_ARG_DEFAULTS = dict(
+    system_id=1,
+    component_id=1,
+    duration=None,
+    outage_timeout=1.0,
+    recovery_hysteresis=3,
+    all_rates=4,
+    rate_raw_sensors=4,
+    rate_extended_status=4,
+    rate_rc_channels=4,
+    rate_position=4,
+    rate_extra1=4,
+    rate_extra2=4,
+    rate_extra3=4,
+    signing_key=None,
+    signing_link_id=None,
+)
+
+
+class FakeMonitor:
+    """Lightweight stand-in for LinkMonitor (avoids AsyncMock overhead)."""
+
+    def __init__(self, link_id=0, start_result=True):
+        self.link_id = link_id
+        self.start_result = start_result
+        self.csv_filepath = f'/tmp/metrics{link_id}.csv'
+        self.calls = []
+
+    async def start(self):
+        self.calls.append('start')
+        return self.start_result
+
+    async def stop(self):
+        self.calls.append('stop')
+        return f'/tmp/hist{self.link_id}.csv'
+
+
+async def wait_for_calls(mock, count, timeout=1.0):
+    """Yield to the event loop until mock has been called count times."""
+    async def poll():
+        while mock.call_count < count:
+            await asyncio.sleep(0)
+    await asyncio.wait_for(poll(), timeout)
+
+
 class TestMAVLinkTester:
     """Test MAVLinkTester orchestrator functionality."""
 
     @pytest.fixture
     def basic_args(self, temp_output_dir):
         """Create basic argument namespace for testing."""
-        args = argparse.Namespace()
-        args.connections = ['udpin:0.0.0.0:14550']
-        args.system_id = 1
-        args.component_id = 1
-        args.duration = None
-        args.outage_timeout = 1.0
-        args.recovery_hysteresis = 3
-        args.output_dir = temp_output_dir
-        args.all_rates = 4
-        args.rate_raw_sensors = 4
-        args.rate_extended_status = 4
-        args.rate_rc_channels = 4
-        args.rate_position = 4
-        args.rate_extra1 = 4
-        args.rate_extra2 = 4
-        args.rate_extra3 = 4
-        args.signing_key = None
-        args.signing_link_id = None
-        return args
+        return argparse.Namespace(connections=['udpin:0.0.0.0:14550'], output_dir=temp_output_dir, **_ARG_DEFAULTS)
+
+    @pytest.fixture
+    def make_args(self, basic_args):
+        """Factory returning a copy of basic_args with the given overrides applied."""
+        def _make_args(**overrides):
+            return argparse.Namespace(**{**vars(basic_args), **overrides})
+        return _make_args
 
     @pytest.fixture
     def tester(self, basic_args):
         """Create MAVLinkTester instance for testing."""
         return MAVLinkTester(basic_args)
 
+    @pytest.fixture
+    def mock_link_monitor(self, temp_output_dir):
+        """Patch LinkMonitor; yields (MockLinkMonitor, mock_monitor) with a monitor that starts successfully."""
+        with patch.object(mavlink_link_tester, 'LinkMonitor') as MockLinkMonitor:
+            mock_monitor = AsyncMock()
+            mock_monitor.start = AsyncMock(return_value=True)
+            mock_monitor.stop = AsyncMock(return_value=f'{temp_output_dir}/test_histogram.csv')
+            mock_monitor.csv_filepath = f'{temp_output_dir}/test_metrics.csv'
+            MockLinkMonitor.return_value = mock_monitor
+            yield MockLinkMonitor, mock_monitor
+
+    @pytest.fixture(autouse=True)
+    def _remove_signal_handlers(self, event_loop):
+        """Remove the SIGINT/SIGTERM handlers start() installs on the shared event loop."""
+        yield
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                event_loop.remove_signal_handler(sig)
+            except NotImplementedError:
+                pass
+
     def test_initialization(self, tester, basic_args):
         """Test MAVLinkTester initialization."""
         assert tester.args == basic_args
@@ -70,293 +130,156 @@ class TestMAVLinkTester:
         tester._signal_handler(2)  # SIGINT
         assert tester.running is False
 
-    @pytest.mark.asyncio
-    async def test_start_with_single_connection(self, basic_args, temp_output_dir):
-        """Test starting tester with a single connection."""
-        tester = MAVLinkTester(basic_args)
+    @pytest.mark.skipif(sys.platform == 'win32', reason='loop.add_signal_handler is POSIX-only')
+    async def test_sigint_stops_tester(self, tester, mock_link_monitor):
+        """Test that a real SIGINT is routed through the loop's signal handler and stops the tester."""
+        _, mock_monitor = mock_link_monitor
+        # Deliver SIGINT to this process once the monitor has started
+        mock_monitor.start.side_effect = lambda: os.kill(os.getpid(), signal.SIGINT) or True
 
-        # Mock LinkMonitor.start to return True immediately
-        with patch('mavlinklinktester.mavlink_link_tester.LinkMonitor') as MockLinkMonitor:
-            mock_monitor = AsyncMock()
-            mock_monitor.start = AsyncMock(return_value=True)
-            mock_monitor.stop = AsyncMock(return_value='/tmp/test_histogram.csv')
-            mock_monitor.csv_filepath = f'{temp_output_dir}/test_metrics.csv'
-            MockLinkMonitor.return_value = mock_monitor
+        # Fallback so a missing loop handler fails the test instead of interrupting the run
+        previous_handler = signal.signal(signal.SIGINT, lambda *_: None)
+        try:
+            await asyncio.wait_for(tester.start(), timeout=1.0)
 
-            # Start and immediately stop
-            start_task = asyncio.create_task(tester.start())
-            await asyncio.sleep(0.5)
-            tester.running = False
-            await start_task
-
-            # Verify monitor was created
-            assert MockLinkMonitor.called
-
-    @pytest.mark.asyncio
-    async def test_start_with_multiple_connections(self, temp_output_dir):
-        """Test starting tester with multiple connections."""
-        args = argparse.Namespace()
-        args.connections = ['udpin:0.0.0.0:14550', 'udpout:192.168.1.100:14551']
-        args.system_id = 1
-        args.component_id = 1
-        args.duration = None
-        args.outage_timeout = 1.0
-        args.recovery_hysteresis = 3
-        args.output_dir = temp_output_dir
-        args.all_rates = 4
-        args.rate_raw_sensors = 4
-        args.rate_extended_status = 4
-        args.rate_rc_channels = 4
-        args.rate_position = 4
-        args.rate_extra1 = 4
-        args.rate_extra2 = 4
-        args.rate_extra3 = 4
-        args.signing_key = None
-        args.signing_link_id = None
-
-        tester = MAVLinkTester(args)
-
-        with patch('mavlinklinktester.mavlink_link_tester.LinkMonitor') as MockLinkMonitor:
-            mock_monitor = AsyncMock()
-            mock_monitor.start = AsyncMock(return_value=True)
-            mock_monitor.stop = AsyncMock(return_value='/tmp/test_histogram.csv')
-            mock_monitor.csv_filepath = f'{temp_output_dir}/test_metrics.csv'
-            MockLinkMonitor.return_value = mock_monitor
-
-            # Start and immediately stop
-            start_task = asyncio.create_task(tester.start())
-            await asyncio.sleep(0.5)
-            tester.running = False
-            await start_task
-
-            # Verify monitors were created for each connection
-            assert MockLinkMonitor.call_count == 2
-
-    @pytest.mark.asyncio
-    async def test_duration_based_testing(self, temp_output_dir):
+            # Stopped by the signal handler, not by the wait_for timeout cancelling start()
+            assert tester.shutdown_event.is_set()
+            assert tester.running is False
+            assert mock_monitor.stop.called
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
+
+    @pytest.mark.parametrize('connections', [
+        ['udpin:0.0.0.0:14550'],
+        ['udpin:0.0.0.0:14550', 'udpout:192.168.1.100:14551'],
+    ], ids=['single', 'multiple'])
+    async def test_start_with_connections(self, make_args, mock_link_monitor, connections):
+        """Test starting tester with a single connection and with multiple connections."""
+        MockLinkMonitor, mock_monitor = mock_link_monitor
+        tester = MAVLinkTester(make_args(connections=connections))
+
+        # Start and stop as soon as every monitor has started
+        start_task = asyncio.create_task(tester.start())
+        await wait_for_calls(mock_monitor.start, len(connections))
+        tester._signal_handler(signal.SIGINT)
+        await asyncio.wait_for(start_task, timeout=2.0)
+
+        # Verify a monitor was created for each connection
+        assert MockLinkMonitor.call_count == len(connections)
+        assert [c.kwargs['connection_str'] for c in MockLinkMonitor.call_args_list] == connections
+
+    async def test_duration_based_testing(self, make_args, mock_link_monitor):
         """Test that tester stops after specified duration."""
-        args = argparse.Namespace()
-        args.connections = ['udpin:0.0.0.0:14550']
-        args.system_id = 1
-        args.component_id = 1
-        args.duration = 1  # 1 second duration
-        args.outage_timeout = 1.0
-        args.recovery_hysteresis = 3
-        args.output_dir = temp_output_dir
-        args.all_rates = 4
-        args.rate_raw_sensors = 4
-        args.rate_extended_status = 4
-        args.rate_rc_channels = 4
-        args.rate_position = 4
-        args.rate_extra1 = 4
-        args.rate_extra2 = 4
-        args.rate_extra3 = 4
-        args.signing_key = None
-        args.signing_link_id = None
-
-        tester = MAVLinkTester(args)
-
-        with patch('mavlinklinktester.mavlink_link_tester.LinkMonitor') as MockLinkMonitor:
-            mock_monitor = AsyncMock()
-            mock_monitor.start = AsyncMock(return_value=True)
-            mock_monitor.stop = AsyncMock(return_value='/tmp/test_histogram.csv')
-            mock_monitor.csv_filepath = f'{temp_output_dir}/test_metrics.csv'
-            MockLinkMonitor.return_value = mock_monitor
+        _, mock_monitor = mock_link_monitor
+        tester = MAVLinkTester(make_args(duration=0.05))  # 50ms duration
 
-            # Start with duration
-            start_time = asyncio.get_event_loop().time()
-            await tester.start()
-            elapsed = asyncio.get_event_loop().time() - start_time
+        # Start with duration
+        start_time = asyncio.get_running_loop().time()
+        await tester.start()
+        elapsed = asyncio.get_running_loop().time() - start_time
 
-            # Should have stopped around 1 second (allow some overhead)
-            assert 0.5 < elapsed < 2.0
+        # Should have stopped after the 50ms duration (allow some overhead)
+        assert 0.04 < elapsed < 0.5
+        assert mock_monitor.stop.called
 
-    @pytest.mark.asyncio
-    async def test_failed_monitor_start(self, basic_args):
+    async def test_failed_monitor_start(self, tester, mock_link_monitor):
         """Test handling of failed monitor start."""
-        tester = MAVLinkTester(basic_args)
+        MockLinkMonitor, _ = mock_link_monitor
+        MockLinkMonitor.return_value = FakeMonitor(start_result=False)  # Simulate failure
 
-        with patch('mavlinklinktester.mavlink_link_tester.LinkMonitor') as MockLinkMonitor:
-            mock_monitor = AsyncMock()
-            mock_monitor.start = AsyncMock(return_value=False)  # Simulate failure
-            MockLinkMonitor.return_value = mock_monitor
+        # Start should handle failure gracefully
+        await tester.start()
 
-            # Start should handle failure gracefully
-            await tester.start()
-
-            # No monitors should have been added
-            assert len(tester.monitors) == 0
+        # No monitors should have been added
+        assert len(tester.monitors) == 0
 
-    @pytest.mark.asyncio
     async def test_stop_calls_all_monitors(self, basic_args):
         """Test that stop() calls stop on all monitors."""
         tester = MAVLinkTester(basic_args)
 
-        # Create mock monitors
-        mock_monitor1 = AsyncMock()
-        mock_monitor1.stop = AsyncMock(return_value='/tmp/hist1.csv')
-        mock_monitor1.csv_filepath = '/tmp/metrics1.csv'
+        # Create fake monitors
+        monitor1 = FakeMonitor(link_id=1)
+        monitor2 = FakeMonitor(link_id=2)
 
-        mock_monitor2 = AsyncMock()
-        mock_monitor2.stop = AsyncMock(return_value='/tmp/hist2.csv')
-        mock_monitor2.csv_filepath = '/tmp/metrics2.csv'
-
-        tester.monitors = [mock_monitor1, mock_monitor2]
+        tester.monitors = [monitor1, monitor2]
         tester.running = True
 
         # Stop tester
         await tester.stop()
 
         # Both monitors should be stopped
-        assert mock_monitor1.stop.called
-        assert mock_monitor2.stop.called
+        assert monitor1.calls == ['stop']
+        assert monitor2.calls == ['stop']
 
-    @pytest.mark.asyncio
     async def test_stop_idempotent(self, tester):
         """Test that stop() can be called multiple times safely."""
-        tester.running = False
-        tester.stopping = False
+        monitor = FakeMonitor()
+        tester.monitors = [monitor]
+        tester.running = True
 
-        # First stop
+        # First stop does the cleanup, second stop should be no-op
         await tester.stop()
-
-        # Second stop should be no-op
         await tester.stop()
 
-    def test_stream_rate_configuration(self, temp_output_dir):
-        """Test that stream rates are properly configured."""
-        args = argparse.Namespace()
-        args.connections = ['udpin:0.0.0.0:14550']
-        args.system_id = 1
-        args.component_id = 1
-        args.duration = None
-        args.outage_timeout = 1.0
-        args.recovery_hysteresis = 3
-        args.output_dir = temp_output_dir
-        args.all_rates = -1
-        args.rate_raw_sensors = 10
-        args.rate_extended_status = 5
-        args.rate_rc_channels = 8
-        args.rate_position = 6
-        args.rate_extra1 = 7
-        args.rate_extra2 = 9
-        args.rate_extra3 = 11
-        args.signing_key = None
-        args.signing_link_id = None
-
-        tester = MAVLinkTester(args)
-
-        # Verify args are set correctly
-        assert tester.args.rate_raw_sensors == 10
-        assert tester.args.rate_extended_status == 5
-        assert tester.args.rate_rc_channels == 8
-        assert tester.args.rate_position == 6
-        assert tester.args.rate_extra1 == 7
-        assert tester.args.rate_extra2 == 9
-        assert tester.args.rate_extra3 == 11
-
-    def test_signing_configuration(self, temp_output_dir):
-        """Test MAVLink signing configuration."""
-        args = argparse.Namespace()
-        args.connections = ['udpin:0.0.0.0:14550']
-        args.system_id = 1
-        args.component_id = 1
-        args.duration = None
-        args.outage_timeout = 1.0
-        args.recovery_hysteresis = 3
-        args.output_dir = temp_output_dir
-        args.rate_raw_sensors = 4
-        args.rate_extended_status = 4
-        args.rate_rc_channels = 4
-        args.rate_position = 4
-        args.rate_extra1 = 4
-        args.rate_extra2 = 4
-        args.rate_extra3 = 4
-        args.signing_key = b'0123456789abcdef0123456789abcdef'
-        args.signing_link_id = 5
-
-        tester = MAVLinkTester(args)
-
-        # Verify signing args are set
-        assert tester.args.signing_key == b'0123456789abcdef0123456789abcdef'
-        assert tester.args.signing_link_id == 5
-
-    @pytest.mark.asyncio
-    async def test_keyboard_interrupt_handling(self, basic_args):
-        """Test handling of KeyboardInterrupt."""
-        tester = MAVLinkTester(basic_args)
+        # The monitor was only stopped once
+        assert monitor.calls == ['stop']
+        assert tester.stopping is True
 
-        with patch('mavlinklinktester.mavlink_link_tester.LinkMonitor') as MockLinkMonitor:
-            mock_monitor = AsyncMock()
-            mock_monitor.start = AsyncMock(return_value=True)
-            mock_monitor.stop = AsyncMock(return_value='/tmp/test_histogram.csv')
-            mock_monitor.csv_filepath = '/tmp/test_metrics.csv'
-            MockLinkMonitor.return_value = mock_monitor
-
-            # Simulate KeyboardInterrupt after start
-            async def interrupt_after_start():
-                await asyncio.sleep(0.3)
-                tester.running = False
-
-            asyncio.create_task(interrupt_after_start())
+    async def test_keyboard_interrupt_handling(self, tester, mock_link_monitor):
+        """Test handling of KeyboardInterrupt."""
+        _, mock_monitor = mock_link_monitor
+        # Simulate Ctrl+C arriving while the monitor is starting
+        mock_monitor.start.side_effect = lambda: tester._signal_handler(signal.SIGINT) or True
 
-            # Should handle gracefully
-            await tester.start()
+        # Should handle gracefully
+        await asyncio.wait_for(tester.start(), timeout=2.0)
 
-            # Monitor should have been stopped
-            assert mock_monitor.stop.called
+        # Monitor should have been stopped
+        assert mock_monitor.stop.called
 
-    @pytest.mark.asyncio
-    async def test_no_successful_monitors(self, basic_args):
+    async def test_no_successful_monitors(self, tester, mock_link_monitor):
         """Test behavior when no monitors start successfully."""
-        tester = MAVLinkTester(basic_args)
+        MockLinkMonitor, _ = mock_link_monitor
+        fake_monitor = FakeMonitor(start_result=False)  # All fail
+        MockLinkMonitor.return_value = fake_monitor
 
-        with patch('mavlinklinktester.mavlink_link_tester.LinkMonitor') as MockLinkMonitor:
-            mock_monitor = AsyncMock()
-            mock_monitor.start = AsyncMock(return_value=False)  # All fail
-            MockLinkMonitor.return_value = mock_monitor
-
-            # Should exit gracefully
-            await tester.start()
-
-            # No monitors should be in the list
-            assert len(tester.monitors) == 0
-            assert tester.running is False
+        # Should exit gracefully
+        await tester.start()
 
-    def test_output_directory_configuration(self, basic_args):
-        """Test output directory configuration."""
-        assert basic_args.output_dir is not None
-        assert isinstance(basic_args.output_dir, str)
+        # No monitors should be in the list, and none stopped
+        assert len(tester.monitors) == 0
+        assert tester.running is False
+        assert fake_monitor.calls == ['start']
 
-    @pytest.mark.asyncio
     async def test_concurrent_monitor_stop(self, basic_args):
         """Test that monitors are stopped concurrently."""
         tester = MAVLinkTester(basic_args)
 
-        # Create multiple mock monitors with delays
-        monitors = []
-        for i in range(3):
-            mock_monitor = AsyncMock()
-
-            async def delayed_stop():
-                await asyncio.sleep(0.1)
+        # Each monitor's stop() blocks until every monitor has entered stop(),
+        # which can only happen if they are awaited concurrently
+        entered = []
+        all_entered = asyncio.Event()
+
+        def make_stop(i):
+            async def blocking_stop():
+                entered.append(i)
+                if len(entered) == 3:
+                    all_entered.set()
+                await all_entered.wait()
                 return f'/tmp/hist{i}.csv'
+            return blocking_stop
 
-            mock_monitor.stop = AsyncMock(side_effect=delayed_stop)
-            mock_monitor.csv_filepath = f'/tmp/metrics{i}.csv'
-            monitors.append(mock_monitor)
+        monitors = []
+        for i in range(3):
+            monitor = FakeMonitor(link_id=i)
+            monitor.stop = make_stop(i)
+            monitors.append(monitor)
 
         tester.monitors = monitors
         tester.running = True
 
-        # Stop all monitors
-        start_time = asyncio.get_event_loop().time()
-        await tester.stop()
-        elapsed = asyncio.get_event_loop().time() - start_time
-
-        # Should take ~0.1s (concurrent), not ~0.3s (sequential)
-        assert elapsed < 0.25  # Allow some overhead
+        # Stopping the monitors one at a time would never complete
+        await asyncio.wait_for(tester.stop(), timeout=1.0)
 
         # All monitors should be stopped
-        for monitor in monitors:
-            assert monitor.stop.called
+        assert sorted(entered) == [0, 1, 2]